@@ -1,33 +1,85 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func
-from datetime import datetime, timedelta
-import pytz
+from flask_caching import Cache
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import load_only
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import functools
+import io
 import os
 
+try:  # C ISO-8601 parser; same naive/aware semantics as datetime.fromisoformat
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+    parse_iso_datetime = datetime.fromisoformat
+
+try:  # C JSON encoder for jsonify; stdlib json is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # gzip/br response compression
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # ----------------------------
 # Config
 # ----------------------------
 APP_TZ = "Asia/Kolkata"
+APP_TZ_OBJ = ZoneInfo(APP_TZ)
+UTC = timezone.utc
 DEFAULT_LOG_BASE_URL = os.environ.get("LOG_BASE_URL", "https://logs.example.com/request/")
+WINDOW_LABEL_FMT = "%a, %b %d"
+WINDOW_RANGE_FMT = "%b %d, %I:%M %p"
+SUMMARY_CACHE_TIMEOUT = 30  # seconds; summaries only move when new runs land
+DETAILS_PAGE_SIZE = 100
+INGEST_CHUNK_SIZE = 500  # keeps IN (...) lists under SQLite's bound-parameter limit
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() through orjson, keeping Flask's sorted-key output.
+
+    Only encoding is swapped: request bodies stay on the stdlib parser, which
+    keeps big integers exact and accepts NaN/Infinity.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret")
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///regdash.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["CACHE_TYPE"] = os.environ.get("CACHE_TYPE", "SimpleCache")
 
 db = SQLAlchemy(app)
+cache = Cache(app)
+if Compress is not None:
+    Compress(app)
 
 # ----------------------------
 # Models
 # ----------------------------
 class Run(db.Model):
     __tablename__ = "runs"
+    __table_args__ = (
+        # composite indexes for the window filter + status/cloud/reason + started_at sort
+        db.Index("ix_runs_started_status", "started_at", "status"),
+        db.Index("ix_runs_status_started", "status", "started_at"),
+        db.Index("ix_runs_cloud_status_started", "cloud", "status", "started_at"),
+        db.Index("ix_runs_status_reason_started", "status", "reason", "started_at"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     request_id = db.Column(db.String(32), unique=True, index=True, nullable=False)
     scheduler = db.Column(db.String(128), index=True, nullable=False, default="BLR-NSP-SCHEDULER1")
     cloud = db.Column(db.String(32), index=True, nullable=True)  # "blr-cloud4" | "blr-cloud5"
-    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    started_at = db.Column(db.DateTime, nullable=False)  # indexed via ix_runs_started_status
     ended_at = db.Column(db.DateTime, nullable=True, index=True)
     status = db.Column(db.String(16), nullable=False)  # PASSED/FAILED/KILLED/etc.
     reason = db.Column(db.String(128), nullable=True)  # failure reason bucket
@@ -35,45 +87,40 @@ class Run(db.Model):
     notes = db.Column(db.Text, nullable=True)
 
     def to_dict(self, with_links: bool = True):
-        d = {
-            "request_id": self.request_id,
-            "scheduler": self.scheduler,
-            "cloud": self.cloud,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
-            "status": self.status,
-            "reason": self.reason,
-            "subreason": self.subreason,
-            "notes": self.notes,
-        }
-        if with_links:
-            d["log_url"] = f"{DEFAULT_LOG_BASE_URL}{self.request_id}"
-        return d
+        return run_row_to_dict(self, with_links=with_links)
 
 # ----------------------------
 # Helpers
 # ----------------------------
+_window_cache = (None, None)  # (anchor date, bounds) of the current "now" window
+
+
 def get_window_bounds(ref_dt_local: datetime = None):
     """Compute 24h window from 10:00 local to next-day 10:00 local."""
-    tz = pytz.timezone(APP_TZ)
-    now_local = ref_dt_local or datetime.now(tz)
+    global _window_cache
+    now_local = ref_dt_local or datetime.now(APP_TZ_OBJ)
     # Anchor is today's 10:00:01, else yesterday 10:00:01
-    ten_am_today = tz.localize(datetime(now_local.year, now_local.month, now_local.day, 10, 0, 1))
-    if now_local >= ten_am_today:
-        start_local = ten_am_today
-    else:
-        start_local = ten_am_today - timedelta(days=1)
+    anchor = now_local.date()
+    if (now_local.hour, now_local.minute, now_local.second) < (10, 0, 1):
+        anchor -= timedelta(days=1)
+    if ref_dt_local is None:
+        cached_anchor, cached = _window_cache
+        if anchor == cached_anchor:
+            return cached
+    start_local = datetime(anchor.year, anchor.month, anchor.day, 10, 0, 1, tzinfo=APP_TZ_OBJ)
     end_local = start_local + timedelta(days=1)
     # store/compare as naive UTC in DB
-    start_utc = start_local.astimezone(pytz.UTC).replace(tzinfo=None)
-    end_utc = end_local.astimezone(pytz.UTC).replace(tzinfo=None)
-    return start_local, end_local, start_utc, end_utc
+    start_utc = start_local.astimezone(UTC).replace(tzinfo=None)
+    end_utc = end_local.astimezone(UTC).replace(tzinfo=None)
+    bounds = (start_local, end_local, start_utc, end_utc)
+    if ref_dt_local is None:  # explicit refs (build_windows, ?day=) must not evict "now"
+        _window_cache = (anchor, bounds)
+    return bounds
 
 def parse_dt_local(s, fmt="%Y-%m-%d %H:%M:%S"):
     if not s:
         return None
-    tz = pytz.timezone(APP_TZ)
-    return tz.localize(datetime.strptime(s, fmt)).astimezone(pytz.UTC).replace(tzinfo=None)
+    return datetime.strptime(s, fmt).replace(tzinfo=APP_TZ_OBJ).astimezone(UTC).replace(tzinfo=None)
 
 
 def parse_iso_utc(value: str):
@@ -84,13 +131,12 @@ def parse_iso_utc(value: str):
     except ValueError:
         return None
     if dt.tzinfo:
-        return dt.astimezone(pytz.UTC).replace(tzinfo=None)
+        return dt.astimezone(UTC).replace(tzinfo=None)
     return dt
 
 
 def resolve_window_from_request():
     """Determine which 24h window to use based on query args."""
-    tz = pytz.timezone(APP_TZ)
     start_param = request.args.get("start")
     end_param = request.args.get("end")
     day_param = request.args.get("day")
@@ -99,42 +145,92 @@ def resolve_window_from_request():
         start_utc = parse_iso_utc(start_param)
         end_utc = parse_iso_utc(end_param)
         if start_utc and end_utc:
-            start_local = pytz.UTC.localize(start_utc).astimezone(tz)
-            end_local = pytz.UTC.localize(end_utc).astimezone(tz)
+            start_local = start_utc.replace(tzinfo=UTC).astimezone(APP_TZ_OBJ)
+            end_local = end_utc.replace(tzinfo=UTC).astimezone(APP_TZ_OBJ)
             return start_local, end_local, start_utc, end_utc
 
     if day_param:
         try:
-            day = datetime.strptime(day_param, "%Y-%m-%d")
-            ref_local = tz.localize(datetime(day.year, day.month, day.day, 12, 0, 0))
+            day = date.fromisoformat(day_param)
+            ref_local = datetime(day.year, day.month, day.day, 12, 0, 0, tzinfo=APP_TZ_OBJ)
             return get_window_bounds(ref_local)
         except ValueError:
             pass
 
     return get_window_bounds()
 
+
+@functools.lru_cache(maxsize=8)
+def build_windows(anchor_local: datetime):
+    """Last 7 windows ending with the one starting at anchor_local; only changes at 10:00 local."""
+    windows = []
+    for offset in range(7):
+        ref = anchor_local - timedelta(days=offset)
+        start_local, end_local, start_utc, end_utc = get_window_bounds(ref)
+        windows.append({
+            "label": start_local.strftime(WINDOW_LABEL_FMT),
+            "range_label": f"{start_local.strftime(WINDOW_RANGE_FMT)} → {end_local.strftime(WINDOW_RANGE_FMT)}",
+            "start_iso": start_utc.isoformat(),
+            "end_iso": end_utc.isoformat()
+        })
+    return windows
+
+
+@cache.memoize(timeout=SUMMARY_CACHE_TIMEOUT)
+def summarize_window(start_utc, end_utc):
+    """Status totals and FAILED-reason buckets for a window in one GROUP BY."""
+    rows = db.session.execute(
+        select(Run.status, Run.reason, func.count(Run.id))
+        .where(Run.started_at >= start_utc, Run.started_at < end_utc)
+        .group_by(Run.status, Run.reason)
+        .order_by(Run.status, Run.reason)
+    ).all()
+    status_map = {}
+    failures_map = {}
+    for status, reason, c in rows:
+        status_map[status] = status_map.get(status, 0) + c
+        if status == "FAILED":
+            key = reason or "Unknown"
+            failures_map[key] = failures_map.get(key, 0) + c
+    failures = [{"reason": r, "count": c} for r, c in failures_map.items()]
+    return sum(status_map.values()), status_map, failures
+
+
+# List endpoints leave out the long free-form columns unless ?full=1 is passed
+RUN_LIST_COLUMNS = (
+    Run.request_id, Run.scheduler, Run.cloud, Run.started_at, Run.ended_at,
+    Run.status, Run.reason,
+)
+RUN_COLUMNS = RUN_LIST_COLUMNS + (Run.subreason, Run.notes)
+
+
+def wants_full_rows():
+    return request.args.get("full") == "1"
+
+
+def run_row_to_dict(row, full: bool = True, with_links: bool = True):
+    """Serialize a Run or a plain Core row with the Run columns (no ORM hydration needed)."""
+    rid = row.request_id
+    started_at, ended_at = row.started_at, row.ended_at
+    return {
+        "request_id": rid,
+        "scheduler": row.scheduler,
+        "cloud": row.cloud,
+        "started_at": started_at.isoformat() if started_at else None,
+        "ended_at": ended_at.isoformat() if ended_at else None,
+        "status": row.status,
+        "reason": row.reason,
+        **({"subreason": row.subreason, "notes": row.notes} if full else {}),
+        **({"log_url": f"{DEFAULT_LOG_BASE_URL}{rid}"} if with_links else {}),
+    }
+
 # ----------------------------
 # Routes (pages)
 # ----------------------------
 @app.route("/")
 def index():
     start_local, end_local, start_utc, end_utc = get_window_bounds()
-    q = Run.query.filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-    total_runs = q.count()
-    status_counts = (
-        db.session.query(Run.status, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-        .group_by(Run.status)
-        .all()
-    )
-    status_map = {s: c for s, c in status_counts}
-    failures = (
-        db.session.query(Run.reason, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc, Run.status == "FAILED")
-        .group_by(Run.reason)
-        .all()
-    )
-    failures = [{"reason": r or "Unknown", "count": c} for r, c in failures]
+    total_runs, status_map, failures = summarize_window(start_utc, end_utc)
     return render_template(
         "index.html",
         start_local=start_local,
@@ -144,7 +240,7 @@ def index():
         failed=status_map.get("FAILED", 0),
         killed=status_map.get("KILLED", 0),
         failures=failures,
-        window_label=f"{start_local.strftime('%b %d, %I:%M %p')} → {end_local.strftime('%b %d, %I:%M %p')}",
+        window_label=f"{start_local.strftime(WINDOW_RANGE_FMT)} → {end_local.strftime(WINDOW_RANGE_FMT)}",
     )
 
 @app.route("/details")
@@ -156,89 +252,137 @@ def details():
     if start and end:
         start_utc = parse_dt_local(start)
         end_utc = parse_dt_local(end)
-    rows = (
+    try:
+        size = int(request.args.get("size", DETAILS_PAGE_SIZE))
+    except (TypeError, ValueError):
+        size = DETAILS_PAGE_SIZE
+    size = max(1, min(size, 1000))
+
+    q = (
         Run.query
+        .options(load_only(*RUN_LIST_COLUMNS, Run.subreason))  # table never shows notes
         .filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-        .order_by(Run.started_at.desc())
-        .all()
     )
-    return render_template("details.html", rows=rows, start_local=start_local, end_local=end_local)
+    # Dashboard failure buckets link here with ?reason= (and ?status=FAILED)
+    status = request.args.get("status")
+    reason = request.args.get("reason")
+    if status:
+        q = q.filter(Run.status == status)
+    if reason == "Unknown":  # bucket label summarize_window() uses for NULL reasons
+        q = q.filter(or_(Run.reason.is_(None), Run.reason == reason))
+    elif reason:
+        q = q.filter(Run.reason == reason)
+    if status or reason:
+        total_runs = q.order_by(None).count()
+    else:
+        total_runs, _, _ = summarize_window(start_utc, end_utc)
+
+    # Keyset pagination on (started_at, id): each page is an index range scan, no OFFSET
+    before = parse_iso_utc(request.args.get("before"))
+    before_id = request.args.get("before_id", type=int)
+    if before and before_id is not None:
+        q = q.filter(or_(
+            Run.started_at < before,
+            (Run.started_at == before) & (Run.id < before_id),
+        ))
+    elif before:
+        q = q.filter(Run.started_at < before)
+    rows = q.order_by(Run.started_at.desc(), Run.id.desc()).limit(size + 1).all()
+
+    older_url = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        args = request.args.to_dict()
+        args.update(before=last.started_at.isoformat(), before_id=last.id)
+        older_url = url_for("details", **args)
+    newest_args = {k: v for k, v in request.args.items() if k not in ("before", "before_id")}
+    newest_url = url_for("details", **newest_args) if before else None
+    return render_template(
+        "details.html",
+        rows=rows,
+        start_local=start_local,
+        end_local=end_local,
+        total_runs=total_runs,
+        older_url=older_url,
+        newest_url=newest_url,
+    )
 
 # ----------------------------
 # APIs
 # ----------------------------
 @app.route("/api/summary")
+@cache.cached(timeout=SUMMARY_CACHE_TIMEOUT, query_string=True)
 def api_summary():
     start_local, end_local, start_utc, end_utc = resolve_window_from_request()
-    q = Run.query.filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-    total_runs = q.count()
-    status_counts = (
-        db.session.query(Run.status, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-        .group_by(Run.status)
-        .all()
-    )
-    failures = (
-        db.session.query(Run.reason, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc, Run.status == "FAILED")
-        .group_by(Run.reason)
-        .all()
-    )
+    total_runs, status_map, failures = summarize_window(start_utc, end_utc)
     return jsonify({
         "window": {
             "start_iso": start_local.isoformat(),
             "end_iso": end_local.isoformat()
         },
         "total_runs": total_runs,
-        "status_counts": {s: c for s, c in status_counts},
-        "failures": [{"reason": r or "Unknown", "count": c} for r, c in failures]
+        "status_counts": status_map,
+        "failures": failures
     })
 
 @app.route("/api/failures")
 def api_failures():
     """List failed runs grouped by reason within window."""
     start_local, end_local, start_utc, end_utc = resolve_window_from_request()
-    failed_runs = (
-        Run.query.filter(Run.started_at >= start_utc, Run.started_at < end_utc, Run.status == "FAILED")
-        .order_by(Run.reason, Run.started_at.desc())
-        .all()
-    )
+    window_failed = (Run.started_at >= start_utc, Run.started_at < end_utc, Run.status == "FAILED")
+    full = wants_full_rows()
     out = {}
-    for r in failed_runs:
+    stmt = (
+        select(*(RUN_COLUMNS if full else RUN_LIST_COLUMNS))
+        .where(*window_failed)
+        .order_by(Run.reason, Run.started_at.desc())  # rows arrive already grouped by reason
+        .execution_options(yield_per=500)
+    )
+    for r in db.session.execute(stmt):
         key = r.reason or "Unknown"
-        out.setdefault(key, []).append(r.to_dict())
+        out.setdefault(key, []).append(run_row_to_dict(r, full))
     return jsonify(out)
 
 @app.route("/api/runs")
 def api_runs():
     """All runs in window (optionally filter by status/reason/scheduler/cloud)."""
     start_local, end_local, start_utc, end_utc = resolve_window_from_request()
-    q = Run.query.filter(Run.started_at >= start_utc, Run.started_at < end_utc)
+    full = wants_full_rows()
+    stmt = select(*(RUN_COLUMNS if full else RUN_LIST_COLUMNS)).where(Run.started_at >= start_utc, Run.started_at < end_utc)
     status = request.args.get("status")
     reason = request.args.get("reason")
     scheduler = request.args.get("scheduler")
     cloud = request.args.get("cloud")
     if status:
-        q = q.filter(Run.status == status)
+        stmt = stmt.where(Run.status == status)
     if reason:
-        q = q.filter(Run.reason == reason)
+        stmt = stmt.where(Run.reason == reason)
     if scheduler:
-        q = q.filter(Run.scheduler == scheduler)
+        stmt = stmt.where(Run.scheduler == scheduler)
     if cloud:
-        q = q.filter(Run.cloud == cloud)
-    rows = [r.to_dict() for r in q.order_by(Run.started_at.desc()).all()]
+        stmt = stmt.where(Run.cloud == cloud)
+    stmt = stmt.order_by(Run.started_at.desc()).execution_options(yield_per=500)
+    rows = [run_row_to_dict(r, full) for r in db.session.execute(stmt)]
     return jsonify(rows)
 
+@app.route("/api/runs/<request_id>")
+def api_run(request_id):
+    """Single run with every column, for drill-down from the list endpoints."""
+    run = Run.query.filter_by(request_id=request_id).first()
+    if not run:
+        return jsonify({"error": "Run not found"}), 404
+    return jsonify(run.to_dict())
+
 @app.route("/api/by_cloud")
 def api_by_cloud():
     """Aggregate counts per cloud and status within the 24h window."""
     start_local, end_local, start_utc, end_utc = resolve_window_from_request()
-    rows = (
-        db.session.query(Run.cloud, Run.status, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc)
+    rows = db.session.execute(
+        select(Run.cloud, Run.status, func.count(Run.id))
+        .where(Run.started_at >= start_utc, Run.started_at < end_utc)
         .group_by(Run.cloud, Run.status)
-        .all()
-    )
+    ).all()
     out = {}
     for cloud, status, cnt in rows:
         c = cloud or "unknown"
@@ -249,18 +393,8 @@ def api_by_cloud():
 @app.route("/api/windows")
 def api_windows():
     """List the last 7 selectable windows."""
-    tz = pytz.timezone(APP_TZ)
-    now_local = datetime.now(tz)
-    windows = []
-    for offset in range(7):
-        ref = now_local - timedelta(days=offset)
-        start_local, end_local, start_utc, end_utc = get_window_bounds(ref)
-        windows.append({
-            "label": start_local.strftime("%a, %b %d"),
-            "range_label": f"{start_local.strftime('%b %d, %I:%M %p')} → {end_local.strftime('%b %d, %I:%M %p')}",
-            "start_iso": start_utc.isoformat(),
-            "end_iso": end_utc.isoformat()
-        })
+    start_local, _, _, _ = get_window_bounds()
+    windows = build_windows(start_local)
     return jsonify({"windows": windows})
 
 @app.route("/api/cloud_trend")
@@ -272,14 +406,13 @@ def api_cloud_trend():
         days = 7
     days = max(1, min(days, 30))
 
-    tz = pytz.timezone(APP_TZ)
-    now_local = datetime.now(tz)
-    midnight_today = tz.localize(datetime(now_local.year, now_local.month, now_local.day, 0, 0, 0))
+    now_local = datetime.now(APP_TZ_OBJ)
+    midnight_today = datetime(now_local.year, now_local.month, now_local.day, 0, 0, 0, tzinfo=APP_TZ_OBJ)
     start_local = midnight_today - timedelta(days=days - 1)
     end_local = midnight_today + timedelta(days=1)
 
-    start_utc = start_local.astimezone(pytz.UTC).replace(tzinfo=None)
-    end_utc = end_local.astimezone(pytz.UTC).replace(tzinfo=None)
+    start_utc = start_local.astimezone(UTC).replace(tzinfo=None)
+    end_utc = end_local.astimezone(UTC).replace(tzinfo=None)
 
     day_labels = [
         (start_local + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -287,38 +420,46 @@ def api_cloud_trend():
     ]
 
     date_expr = func.date(Run.started_at)
-    rows = (
-        db.session.query(date_expr.label("run_date"), Run.cloud, Run.status, func.count(Run.id))
-        .filter(Run.started_at >= start_utc, Run.started_at < end_utc)
-        .group_by("run_date", Run.cloud, Run.status)
-        .all()
-    )
+    rows = db.session.execute(
+        select(
+            date_expr.label("run_date"),
+            Run.cloud,
+            func.count(Run.id).filter(Run.status == "PASSED").label("passed"),
+            func.count(Run.id).filter(Run.status != "PASSED").label("failed"),
+            func.count(Run.id).label("total"),
+        )
+        .where(Run.started_at >= start_utc, Run.started_at < end_utc)
+        .group_by("run_date", Run.cloud)
+    ).all()
+
+    # Bucket by integer (cloud, day) index; date strings only exist in day_labels
+    start_date = start_local.date()
+    day_index = {label: i for i, label in enumerate(day_labels)}
+
+    def empty_series():
+        return [{"date": day, "passed": 0, "failed": 0, "total": 0} for day in day_labels]
 
     default_clouds = ["blr-cloud4", "blr-cloud5"]
-    clouds = {c: {} for c in default_clouds}
-    for run_date, cloud, status, count in rows:
-        date_key = run_date if isinstance(run_date, str) else run_date.strftime("%Y-%m-%d")
-        cloud_key = cloud or "unknown"
-        day_bucket = clouds.setdefault(cloud_key, {}).setdefault(
-            date_key, {"passed": 0, "failed": 0, "total": 0}
-        )
-        if status == "PASSED":
-            day_bucket["passed"] += count
+    clouds = {c: empty_series() for c in default_clouds}
+    for run_date, cloud, passed, failed, total in rows:
+        if isinstance(run_date, str):  # SQLite returns date() as text
+            i = day_index.get(run_date)
         else:
-            day_bucket["failed"] += count
-        day_bucket["total"] += count
-
-    clouds_sorted = {}
-    for cloud_name, stats_by_day in clouds.items():
-        series = []
-        for day in day_labels:
-            bucket = stats_by_day.get(day, {"passed": 0, "failed": 0, "total": 0})
-            series.append({"date": day, **bucket})
-        clouds_sorted[cloud_name] = series
+            i = (run_date - start_date).days
+        cloud_key = cloud or "unknown"
+        series = clouds.get(cloud_key)
+        if series is None:
+            series = clouds[cloud_key] = empty_series()
+        if i is None or not 0 <= i < days:
+            continue
+        bucket = series[i]
+        bucket["passed"] += passed
+        bucket["failed"] += failed
+        bucket["total"] += total
 
     return jsonify({
         "days": day_labels,
-        "clouds": clouds_sorted,
+        "clouds": clouds,
         "window": {
             "start_iso": start_local.isoformat(),
             "end_iso": end_local.isoformat()
@@ -336,42 +477,103 @@ def ingest_json():
     payload = request.get_json(force=True, silent=False)
     if not isinstance(payload, list):
         return jsonify({"error": "Expected a JSON array"}), 400
-    added, updated = 0, 0
+    rows = {}
     for item in payload:
         rid = str(item["request_id"])
-        rec = Run.query.filter_by(request_id=rid).first()
-        if not rec:
-            rec = Run(request_id=rid)
-            db.session.add(rec)
-            added += 1
+        rows[rid] = {
+            "request_id": rid,
+            "scheduler": item.get("scheduler", "BLR-NSP-SCHEDULER1"),
+            "cloud": item.get("cloud"),  # "blr-cloud4" or "blr-cloud5"
+            "started_at": parse_iso_datetime(item["started_at"]),
+            "ended_at": parse_iso_datetime(item["ended_at"]) if item.get("ended_at") else None,
+            "status": item.get("status", "FAILED"),
+            "reason": item.get("reason"),
+            "subreason": item.get("subreason"),
+            "notes": item.get("notes"),
+        }
+
+    # One IN (...) lookup per chunk instead of a SELECT per row
+    rids = list(rows)
+    existing = {}
+    for i in range(0, len(rids), INGEST_CHUNK_SIZE):
+        chunk = rids[i:i + INGEST_CHUNK_SIZE]
+        existing.update(
+            db.session.query(Run.request_id, Run.id).filter(Run.request_id.in_(chunk)).all()
+        )
+
+    to_insert, to_update = [], []
+    for rid, row in rows.items():
+        if rid in existing:
+            to_update.append({"id": existing[rid], **row})
         else:
-            updated += 1
-
-        rec.scheduler = item.get("scheduler", "BLR-NSP-SCHEDULER1")
-        rec.cloud = item.get("cloud")  # "blr-cloud4" or "blr-cloud5"
-        rec.started_at = datetime.fromisoformat(item["started_at"])
-        rec.ended_at = datetime.fromisoformat(item["ended_at"]) if item.get("ended_at") else None
-        rec.status = item.get("status", "FAILED")
-        rec.reason = item.get("reason")
-        rec.subreason = item.get("subreason")
-        rec.notes = item.get("notes")
+            to_insert.append(row)
+    db.session.bulk_insert_mappings(Run, to_insert)
+    db.session.bulk_update_mappings(Run, to_update)
+    # repeated request_ids in one payload count as updates, as before
+    added = len(to_insert)
+    updated = len(payload) - added
     db.session.commit()
+    cache.clear()  # drop memoized summaries and cached /api/summary responses
     flash(f"Ingested {added} new, {updated} updated records.", "success")
     return redirect(url_for("details"))
 
 # ----------------------------
 # CLI helpers
 # ----------------------------
+SEED_COLUMNS = ("request_id", "scheduler", "cloud", "started_at", "ended_at", "status", "reason", "subreason")
+
+
+def bulk_load_runs(rows):
+    """Write seed row dicts through the raw DBAPI cursor (COPY on psycopg2, executemany elsewhere)."""
+    dialect = db.engine.dialect
+    table = Run.__table__
+    # Bind processors format values exactly as the ORM would (e.g. SQLite datetime text)
+    procs = [table.c[c].type.dialect_impl(dialect).bind_processor(dialect) for c in SEED_COLUMNS]
+    params = [
+        tuple(proc(row[c]) if proc else row[c] for c, proc in zip(SEED_COLUMNS, procs))
+        for row in rows
+    ]
+    raw = db.engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        if dialect.driver == "psycopg2":
+            buf = io.StringIO()
+            for values in params:
+                buf.write("\t".join(
+                    r"\N" if v is None
+                    else str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+                    for v in values
+                ))
+                buf.write("\n")
+            buf.seek(0)
+            cur.copy_from(buf, table.name, columns=SEED_COLUMNS)
+        else:
+            marks = {
+                "qmark": ["?"] * len(SEED_COLUMNS),
+                "numeric": [f":{i + 1}" for i in range(len(SEED_COLUMNS))],
+                "named": [f":{c}" for c in SEED_COLUMNS],
+            }.get(dialect.paramstyle, ["%s"] * len(SEED_COLUMNS))
+            if dialect.paramstyle == "named":
+                params = [dict(zip(SEED_COLUMNS, values)) for values in params]
+            cur.executemany(
+                f"INSERT INTO {table.name} ({', '.join(SEED_COLUMNS)}) VALUES ({', '.join(marks)})",
+                params,
+            )
+        cur.close()
+        raw.commit()
+    finally:
+        raw.close()
+
 @app.cli.command("seed-demo")
 def seed_demo():
     """Seed 110 demo runs into the active 24h window, half to blr-cloud4 and half to blr-cloud5."""
     db.create_all()
-    tz = pytz.timezone(APP_TZ)
-    now = datetime.now(tz)
-    ten = tz.localize(datetime(now.year, now.month, now.day, 10, 0, 1))
+    now = datetime.now(APP_TZ_OBJ)
+    ten = datetime(now.year, now.month, now.day, 10, 0, 1, tzinfo=APP_TZ_OBJ)
 
     # Seed inside the same 24h window the dashboard uses
     start = ten if now >= ten else ten - timedelta(days=1)
+    start_utc = start.astimezone(UTC).replace(tzinfo=None)  # APP_TZ has no DST, so offsets add 1:1
 
     reasons = [
         ("FAILED", "Stack Creation Failed", "Helm install Failed"),
@@ -388,31 +590,37 @@ def seed_demo():
     import random, time
     rid_base = int(time.time())  # unique base so re-running doesn't collide
     total = 110
-    added = 0
+    rids = [str(rid_base + i) for i in range(total)]
+    existing = set(db.session.execute(select(Run.request_id).where(Run.request_id.in_(rids))).scalars())
+
+    # draw every random column in one call each instead of per row
+    picks = random.choices(reasons, k=total)
+    durations = random.choices(range(20, 121), k=total)
 
-    for i in range(total):
-        req_id = str(rid_base + i)
-        if Run.query.filter_by(request_id=req_id).first():
+    rows = []
+    for i, req_id in enumerate(rids):
+        if req_id in existing:
             continue  # idempotent
 
-        status, reason, sub = random.choice(reasons)
-        began = (start + timedelta(minutes=13 * i)).astimezone(pytz.UTC).replace(tzinfo=None)
-        ended = began + timedelta(minutes=random.randint(20, 120))
+        status, reason, sub = picks[i]
+        began = start_utc + timedelta(minutes=13 * i)
+        ended = began + timedelta(minutes=durations[i])
         cloud = "blr-cloud4" if i < total / 2 else "blr-cloud5"
 
-        db.session.add(Run(
-            request_id=req_id,
-            scheduler="BLR-NSP-SCHEDULER1",
-            cloud=cloud,
-            started_at=began,
-            ended_at=ended,
-            status=status,
-            reason=reason,
-            subreason=sub
-        ))
-        added += 1
+        rows.append({
+            "request_id": req_id,
+            "scheduler": "BLR-NSP-SCHEDULER1",
+            "cloud": cloud,
+            "started_at": began,
+            "ended_at": ended,
+            "status": status,
+            "reason": reason,
+            "subreason": sub,
+        })
 
+    db.session.bulk_insert_mappings(Run, rows)
     db.session.commit()
+    added = len(rows)
     print(f"Seeded demo data (added {added} rows) in active window.")
 
 
@@ -428,8 +636,7 @@ def seed_week():
     db.drop_all()
     db.create_all()
 
-    tz = pytz.timezone(APP_TZ)
-    now = datetime.now(tz)
+    now = datetime.now(APP_TZ_OBJ)
     rid_base = int(time.time())
     reasons = [
         "Stack Creation Failed",
@@ -448,11 +655,11 @@ def seed_week():
         "Daemonset crashloop",
     ]
 
-    total_inserted = 0
+    rows = []
     for day_offset in range(7):
         day_local = now - timedelta(days=day_offset)
-        window_start_local = tz.localize(datetime(day_local.year, day_local.month, day_local.day, 10, 0, 1))
-        window_start_utc = window_start_local.astimezone(pytz.UTC).replace(tzinfo=None)
+        window_start_local = datetime(day_local.year, day_local.month, day_local.day, 10, 0, 1, tzinfo=APP_TZ_OBJ)
+        window_start_utc = window_start_local.astimezone(UTC).replace(tzinfo=None)
 
         daily_total = 70 + day_offset * 10  # ensure every day differs
         pass_ratio = min(0.65, 0.30 + day_offset * 0.05)
@@ -475,32 +682,51 @@ def seed_week():
 
         cloud_bias = min(0.85, 0.4 + 0.06 * day_offset)  # shift load toward cloud5 over the week
         minutes_step = max(5, int((24 * 60 - 30) / daily_total))
+        cloud_threshold = max(0.1, 1 - cloud_bias)
+
+        # draw every random column for the day in one call each instead of per row
+        durations = random.choices(range(20, 91), k=daily_total)
+        failed_reasons = iter(random.choices(reasons, k=counts["FAILED"]))
+        failed_subs = iter(random.choices(subreasons, k=counts["FAILED"]))
 
-        for idx, status in enumerate(statuses):
+        for idx, (status, duration) in enumerate(zip(statuses, durations)):
             req_id = f"{rid_base}{day_offset:02d}{idx:03d}"
             began = window_start_utc + timedelta(minutes=idx * minutes_step)
-            ended = began + timedelta(minutes=random.randint(20, 90))
-            cloud_threshold = max(0.1, 1 - cloud_bias)
+            ended = began + timedelta(minutes=duration)
             cloud = "blr-cloud4" if (idx / float(daily_total)) < cloud_threshold else "blr-cloud5"
-            reason = random.choice(reasons) if status == "FAILED" else None
-            sub = random.choice(subreasons) if status == "FAILED" else None
-
-            db.session.add(Run(
-                request_id=req_id,
-                scheduler="BLR-NSP-SCHEDULER1",
-                cloud=cloud,
-                started_at=began,
-                ended_at=ended,
-                status=status,
-                reason=reason,
-                subreason=sub
-            ))
-            total_inserted += 1
-
-    db.session.commit()
+            if status == "FAILED":
+                reason, sub = next(failed_reasons), next(failed_subs)
+            else:
+                reason = sub = None
+
+            rows.append({
+                "request_id": req_id,
+                "scheduler": "BLR-NSP-SCHEDULER1",
+                "cloud": cloud,
+                "started_at": began,
+                "ended_at": ended,
+                "status": status,
+                "reason": reason,
+                "subreason": sub,
+            })
+
+    bulk_load_runs(rows)
+    total_inserted = len(rows)
     print(f"Seeded {total_inserted} runs covering the last 7 distinct days.")
 
 
+@app.cli.command("create-indexes")
+def create_indexes():
+    """Build any Run indexes missing from an existing database (safe to re-run).
+
+    Only adds indexes; a superseded one such as ix_runs_started_at must be dropped by hand.
+    """
+    db.create_all()
+    for index in Run.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    print("Indexes up to date.")
+
+
 @app.cli.command("reset-db")
 def reset_db():
     db.drop_all()